@@ -7,8 +7,14 @@ import numpy as np
 class Analyzer(ABC):
     """
     Abstract base class for signal analyzers.
+
+    Attributes:
+        stateful (bool): True for analyzers whose result depends on the sweeps they saw before,
+            which must therefore be given every sweep, in order.
     """
 
+    stateful: bool = False
+
     @abstractmethod
     def plotData(self, X:List[List[float]], ax: Axes) -> None:
         """
@@ -0,0 +1,185 @@
+import numpy as np
+from numpy.typing import NDArray
+from scipy import ndimage
+from Analyzer import Analyzer
+from accumulator import SweepAccumulator
+from matplotlib.axes import Axes
+from typing import Optional, Tuple
+
+class Burst_Analyzer(Analyzer):
+    """
+    Detects bursty transmissions across time instead of judging each sweep on its own.
+
+    The last `window` sweeps are kept as a time x frequency matrix in a ring buffer. Per-bin sums
+    and sums of squares are updated as sweeps enter and leave the window, so the baseline costs
+    the same whatever the window size. A bin is hot when it exceeds its baseline mean by `k`
+    standard deviations, and is left out of the baseline so that bursts do not mask each
+    other; hot bins in the last `span` sweeps are grouped with 2D connected-region
+    labelling, and regions that span at least `min_width_hz` within the newest sweep count as bursts.
+
+    The analyzer expects every sweep to have the same bins (as produced by HackRFModule.scan, or
+    by AnimationPlot, which passes stateful models the whole channel band rather than only the
+    bins above the mean); a change of bin layout restarts the window.
+
+    Attributes:
+        window (int): The number of sweeps in the baseline.
+        span (int): The number of recent sweeps searched for connected bursts.
+        k (float): The number of standard deviations above the baseline mean that makes a bin hot.
+        min_width_hz (float): The minimum frequency extent of a burst.
+        min_sweeps (int): The number of sweeps needed in the baseline before bursts are reported.
+    """
+
+    stateful = True
+
+    def __init__(self, window: int = 20, span: int = 3, k: float = 3.0, min_width_hz: float = 3e6,
+                 min_sweeps: int = 5) -> None:
+        """
+        Initializes the Burst_Analyzer.
+
+        Args:
+            window: The number of sweeps in the baseline.
+            span: The number of recent sweeps searched for connected bursts.
+            k: The number of standard deviations above the baseline mean that makes a bin hot.
+            min_width_hz: The minimum frequency extent of a burst.
+            min_sweeps: The number of sweeps needed in the baseline before bursts are reported.
+        """
+        if window < 2 or span < 1 or min_sweeps < 2 or min_sweeps > window:
+            raise ValueError("Expected window >= 2, span >= 1 and 2 <= min_sweeps <= window.")
+        self.window = window
+        self.span = span
+        self.k = k
+        self.min_width_hz = min_width_hz
+        self.min_sweeps = min_sweeps
+        self._merge = SweepAccumulator()
+        self._hz: Optional[NDArray[np.float64]] = None
+
+    def _reset(self, hz: NDArray[np.float64]) -> None:
+        """
+        Starts an empty window for a new bin layout.
+        """
+        self._hz = hz
+        self._history = np.zeros((self.window, hz.shape[0]))
+        self._kept = np.zeros((self.window, hz.shape[0]), dtype=bool)
+        self._hot = np.zeros((self.span, hz.shape[0]), dtype=bool)
+        self._sum = np.zeros(hz.shape[0])
+        self._sumsq = np.zeros(hz.shape[0])
+        self._n = np.zeros(hz.shape[0])
+        self._filled = 0
+        self._head = 0
+        self._hot_head = 0
+        self._since_refresh = 0
+
+    def _update(self, X: NDArray[np.float64]) -> Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.bool_], int]:
+        """
+        Adds a sweep to the window and finds the bursts that reach it.
+
+        Args:
+            X: A NumPy array of signal data, where each row contains frequency and dB values.
+
+        Returns:
+            The sorted frequencies, their dB values, a mask of the bins that belong to a burst, and the number of bursts.
+        """
+        db = self._merge.merge(X)
+        hz = self._merge.hz
+        if self._hz is None or not np.array_equal(hz, self._hz):
+            self._reset(hz)
+
+        # Compare against the baseline before the new sweep joins it. Bins with too few quiet
+        # samples left are not judged, so a signal that stays on is absorbed into the baseline.
+        hot = np.zeros(hz.shape[0], dtype=bool)
+        if self._filled >= self.min_sweeps:
+            n = np.maximum(self._n, 1)
+            mean = self._sum / n
+            std = np.sqrt(np.maximum(self._sumsq / n - mean * mean, 0))
+            hot = (db > mean + self.k * std) & (self._n >= self.min_sweeps)
+        self._hot[self._hot_head] = hot
+        self._hot_head = (self._hot_head + 1) % self.span
+
+        # Hot bins are left out of the baseline, otherwise a few bursts would inflate the std
+        # enough to hide the following ones for the rest of the window
+        kept = ~hot
+        value = np.where(kept, db, 0.0)
+        if self._filled == self.window:
+            old = self._history[self._head]
+            self._sum -= old
+            self._sumsq -= old * old
+            self._n -= self._kept[self._head]
+        else:
+            self._filled += 1
+        self._history[self._head] = value
+        self._kept[self._head] = kept
+        self._sum += value
+        self._sumsq += value * value
+        self._n += kept
+        self._head = (self._head + 1) % self.window
+
+        # Rebuild the sums now and then so rounding errors from the running updates cannot build up
+        self._since_refresh += 1
+        if self._since_refresh >= self.window:
+            filled = self._history[:self._filled]
+            self._sum = filled.sum(axis=0)
+            self._sumsq = np.square(filled).sum(axis=0)
+            self._n = self._kept[:self._filled].sum(axis=0).astype(np.float64)
+            self._since_refresh = 0
+
+        burst = np.zeros(hz.shape[0], dtype=bool)
+        if not hot.any():
+            return hz, db, burst, 0
+        # Oldest to newest, so the last row is the sweep just added
+        recent = np.roll(self._hot, -self._hot_head, axis=0)
+        labels, _ = ndimage.label(recent)
+        newest = labels[-1]
+        # Regions are measured across the newest sweep only: earlier sweeps can join fragments of
+        # one burst together, but cannot make a stray hot bin next to an old burst count again
+        present = np.unique(newest[newest > 0])
+        columns = np.arange(hz.shape[0])
+        low = np.asarray(ndimage.minimum(columns, newest, present), dtype=np.intp)
+        high = np.asarray(ndimage.maximum(columns, newest, present), dtype=np.intp)
+        wide = present[hz[high] - hz[low] >= self.min_width_hz]
+        burst = np.isin(newest, wide)
+        return hz, db, burst, int(wide.shape[0])
+
+    def plotData(self, X: NDArray[np.float64], ax: Axes) -> None:
+        """
+        Adds the sweep to the window and plots it, highlighting the bins that belong to a burst.
+
+        Args:
+            X: A NumPy array of signal data, where each row contains frequency and dB values.
+            ax: The matplotlib axes to plot on.
+        """
+        hz, db, burst, count = self._update(X)
+        ax.scatter(hz[~burst], db[~burst], s=1, color='grey', alpha=0.5)
+        if count:
+            ax.scatter(hz[burst], db[burst], s=2, alpha=0.75, color='r', label=f'Bursts: {count}')
+
+    def analyse(self, X: NDArray[np.float64]) -> int:
+        """
+        Adds the sweep to the window and counts the bursts that reach it.
+
+        Args:
+            X: A NumPy array of signal data, where each row contains frequency and dB values.
+
+        Returns:
+            The number of bursts wider than `min_width_hz` that include bins of this sweep.
+        """
+        return self._update(X)[3]
+
+if __name__ == "__main__":
+    # Self-check: periodic bursts in stationary noise must all be found, and quiet sweeps must not fire
+    rng = np.random.default_rng(0)
+    # Same bin width as HackRFModule's hackrf_sweep command
+    hz = np.arange(2401e6, 2423e6, 220000.)
+    for period in (3, 5):
+        analyzer = Burst_Analyzer()
+        bursts = found = false_alarms = 0
+        for i in range(90):
+            db = rng.normal(-70, 1, hz.shape[0])
+            burst = i >= analyzer.min_sweeps and i % period == 0
+            if burst:
+                db[40:70] += 15
+                bursts += 1
+            detected = analyzer.analyse(np.column_stack((hz, db))) > 0
+            found += burst and detected
+            false_alarms += detected and not burst
+        print(f"burst every {period} sweeps: found {found}/{bursts}, false alarms {false_alarms}")
+        assert found == bursts and false_alarms == 0
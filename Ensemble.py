@@ -0,0 +1,134 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Optional, Sequence, Union
+import numpy as np
+from numpy.typing import NDArray
+from Analyzer import Analyzer
+from matplotlib.axes import Axes
+from registry import load_analyzer
+
+class Ensemble_Analyzer(Analyzer):
+    """
+    Runs several analyzers on the same sweep in parallel and combines their results.
+
+    Members run on a thread pool, which overlaps well because most of the sklearn and hdbscan
+    work releases the GIL. Members that have not finished within `budget` seconds abstain for
+    that sweep, and are skipped on following sweeps until their late call returns, so a slow
+    model never stalls the sweep loop nor runs twice at once. Members that raise also abstain.
+
+    Attributes:
+        members (Dict[str, Analyzer]): The member analyzers by name.
+        voting (str): 'majority' to count members with a positive score, or 'weighted' to sum weighted scores.
+        weights (Dict[str, float]): The weight of each member for 'weighted' voting.
+        quorum (int): The number of positive votes needed for a detection with 'majority' voting.
+        budget (Optional[float]): The time in seconds members are given per sweep, or None to wait for all.
+        last_scores (Dict[str, Optional[float]]): Each member's score for the last sweep, None if it abstained.
+        timeouts (Dict[str, int]): The number of sweeps each member has missed by running late.
+        errors (Dict[str, int]): The number of calls in which each member raised an exception.
+    """
+
+    VOTING = ("majority", "weighted")
+
+    def __init__(self, members: Union[Sequence[str], Dict[str, Analyzer]] = ("HDBSCAN", "GMM", "IF", "OCSVM"),
+                 voting: str = "majority", weights: Optional[Dict[str, float]] = None,
+                 quorum: Optional[int] = None, budget: Optional[float] = None) -> None:
+        """
+        Initializes the Ensemble_Analyzer.
+
+        Args:
+            members: Registered analyzer names, or a dictionary of already configured analyzers by name.
+            voting: 'majority' or 'weighted'.
+            weights: The weight of each member for 'weighted' voting. Missing members weigh 1.
+            quorum: The number of positive votes needed with 'majority' voting. Defaults to more than half the members.
+            budget: The time in seconds members are given per sweep, or None to wait for all of them.
+        """
+        if voting not in self.VOTING:
+            raise ValueError(f"Voting must be one of {self.VOTING}, got {voting!r} instead.")
+        if not isinstance(members, dict):
+            members = {name: load_analyzer(name) for name in members}
+        if not members:
+            raise ValueError("An ensemble needs at least one member.")
+        self.members: Dict[str, Analyzer] = members
+        self.voting = voting
+        self.weights = {name: 1.0 for name in members}
+        self.weights.update(weights or {})
+        self.quorum = quorum if quorum is not None else len(members) // 2 + 1
+        self.budget = budget
+        self.last_scores: Dict[str, Optional[float]] = {name: None for name in members}
+        self.timeouts: Dict[str, int] = {name: 0 for name in members}
+        self.errors: Dict[str, int] = {name: 0 for name in members}
+        self.stateful = any(getattr(member, "stateful", False) for member in members.values())
+        self._pending: Dict[str, Future] = {}
+        self._pool = ThreadPoolExecutor(max_workers=len(members), thread_name_prefix="ensemble")
+
+    def _collect(self, X: NDArray[np.float64]) -> Dict[str, Optional[float]]:
+        """
+        Sends the sweep to every idle member and gathers the scores that arrive within the budget.
+
+        Args:
+            X: A NumPy array of signal data, where each row contains frequency and dB values.
+
+        Returns:
+            Each member's score, or None if it ran late or raised.
+        """
+        futures: Dict[str, Future] = {}
+        for name, member in self.members.items():
+            pending = self._pending.get(name)
+            if pending is not None:
+                if not pending.done():
+                    continue
+                # The late call's result is stale, but a failure still needs to be recorded
+                del self._pending[name]
+                if pending.exception() is not None:
+                    self.errors[name] += 1
+            futures[name] = self._pool.submit(member.analyse, X)
+        wait(futures.values(), timeout=self.budget)
+
+        scores: Dict[str, Optional[float]] = {name: None for name in self.members}
+        for name in self.members:
+            future = futures.get(name)
+            if future is None or not future.done():
+                if future is not None:
+                    self._pending[name] = future
+                self.timeouts[name] += 1
+                continue
+            try:
+                scores[name] = float(future.result())
+            except Exception:
+                self.errors[name] += 1
+        self.last_scores = scores
+        return scores
+
+    def analyse(self, X: NDArray[np.float64]) -> float:
+        """
+        Runs every member on the sweep and combines their scores.
+
+        Args:
+            X: A NumPy array of signal data, where each row contains frequency and dB values.
+
+        Returns:
+            1 or 0 with 'majority' voting, depending on whether the quorum was reached, or the
+            weighted sum of member scores with 'weighted' voting. Abstaining members contribute nothing.
+        """
+        scores = self._collect(X)
+        if self.voting == "majority":
+            votes = sum(1 for score in scores.values() if score is not None and score > 0)
+            return float(votes >= self.quorum)
+        return sum(self.weights[name] * score for name, score in scores.items() if score is not None)
+
+    def plotData(self, X: NDArray[np.float64], ax: Axes) -> None:
+        """
+        Runs the ensemble on the sweep and plots it, listing each member's vote in the legend.
+
+        Args:
+            X: A NumPy array of signal data, where each row contains frequency and dB values.
+            ax: The matplotlib axes to plot on.
+        """
+        result = self.analyse(X)
+        votes = ", ".join(f"{name}: {'-' if score is None else f'{score:g}'}" for name, score in self.last_scores.items())
+        ax.scatter(X[:, 0], X[:, 1], s=1, color='r' if result > 0 else 'grey', alpha=0.5, label=votes)
+
+    def close(self) -> None:
+        """
+        Shuts down the thread pool without waiting for late members.
+        """
+        self._pool.shutdown(wait=False)
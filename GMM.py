@@ -3,6 +3,7 @@ from sklearn.mixture import GaussianMixture
 from Analyzer import Analyzer
 from matplotlib.axes import Axes
 from typing import List
+from numpy.typing import NDArray
 
 class GMM_Analyzer(Analyzer):
     """
@@ -16,9 +17,14 @@ class GMM_Analyzer(Analyzer):
         data (List[List[float]]): A list to store data points for model fitting.
     """
 
-    def __init__(self) -> None:
-        """Initializes the GMM_Analyzer with a Gaussian Mixture Model of two components."""
+    def __init__(self, db_threshold: float = -60) -> None:
+        """Initializes the GMM_Analyzer with a Gaussian Mixture Model of two components.
+
+        Args:
+            db_threshold: The component centre dB above which `analyse` reports a detection.
+        """
         self.model: GaussianMixture = GaussianMixture(n_components=2, random_state=0)
+        self.db_threshold = db_threshold
         self.data: List[List[float]] = []
 
     def plotData(self, X:List[List[float]], ax: Axes) -> None:
@@ -45,3 +51,16 @@ class GMM_Analyzer(Analyzer):
         # Mark cluster centers
         ax.scatter(cluster_centers[:, 0], cluster_centers[:, 1], s=100, color='red', marker='X', label='Cluster Centers')
         ax.legend()
+
+    def analyse(self, X: NDArray[np.float64]) -> bool:
+        """
+        Fits the GMM model to the data and checks whether the stronger component stands out.
+
+        Args:
+            X: A NumPy array of signal data, where each row contains frequency and dB values.
+
+        Returns:
+            True if the centre of the strongest component lies above `db_threshold`, otherwise False.
+        """
+        self.model.fit(X)
+        return bool(self.model.means_[:, 1].max() > self.db_threshold)
@@ -15,8 +15,16 @@ class HDBSCAN_Analyzer():
     An analyzer that uses HDBSCAN clustering to analyze signal data.
     """
 
-    def __init__(self) -> None:
-        self.model: hdbscan = hdbscan.HDBSCAN(min_cluster_size=8)
+    def __init__(self, min_cluster_size: int = 8, db_threshold: float = -60) -> None:
+        """
+        Initializes the HDBSCAN_Analyzer.
+
+        Args:
+            min_cluster_size: The smallest group of bins HDBSCAN treats as a cluster.
+            db_threshold: The centroid dB above which a cluster counts towards a detection.
+        """
+        self.model: hdbscan = hdbscan.HDBSCAN(min_cluster_size=min_cluster_size)
+        self.db_threshold = db_threshold
         self.start_time = time.time()
         self.count = 0
 
@@ -80,7 +88,7 @@ class HDBSCAN_Analyzer():
         centroids = self._calculate_centroids(X, labels)
         count = 0
         if centroids.shape[0] > 0:
-            y_value_threshold = -60
+            y_value_threshold = self.db_threshold
             high_y_centroids = centroids[centroids[:, 2] > y_value_threshold]
             for label, centroid_x, centroid_y in high_y_centroids:
                 # points = X[labels == label]
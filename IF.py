@@ -3,6 +3,7 @@ from sklearn.ensemble import IsolationForest
 from Analyzer import Analyzer
 from matplotlib.axes import Axes
 from typing import List
+from numpy.typing import NDArray
 
 class IsolationForest_Analyzer(Analyzer):
     """
@@ -13,11 +14,15 @@ class IsolationForest_Analyzer(Analyzer):
         data (List[List[float]]): A list to keep track of data for fitting the model.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, n_estimators: int = 100, contamination: float = 0.01) -> None:
         """
         Initializes the IsolationForest_Analyzer with a predefined Isolation Forest model configuration.
+
+        Args:
+            n_estimators: The number of trees in the forest.
+            contamination: The expected proportion of outliers in a sweep.
         """
-        self.model: IsolationForest = IsolationForest(n_estimators=100, contamination=0.01)
+        self.model: IsolationForest = IsolationForest(n_estimators=n_estimators, contamination=contamination)
         self.data: List[List[float]] = []
 
     def plotData(self, X:List[List[float]], ax: Axes) -> None:
@@ -36,3 +41,20 @@ class IsolationForest_Analyzer(Analyzer):
         # Plot the data points, highlighting anomalies in red
         ax.scatter(X[anomalies == -1, 0], X[anomalies == -1, 1], s=2, color='red', edgecolors='black', label='Anomaly')
         ax.scatter(X[:, 0], X[:, 1], s=1, alpha=0.5)
+
+    def analyse(self, X: NDArray[np.float64]) -> int:
+        """
+        Fits the Isolation Forest model to the data and counts the strong outliers.
+
+        Only outliers above the mean dB of the sweep are counted, so that unusually quiet bins
+        do not contribute to a detection.
+
+        Args:
+            X: A NumPy array of signal data, where each row contains frequency and dB values.
+
+        Returns:
+            The number of outliers whose dB value is above the sweep mean.
+        """
+        self.model.fit(X)
+        outliers = X[self.model.predict(X) == -1]
+        return int(np.count_nonzero(outliers[:, 1] > np.mean(X[:, 1])))
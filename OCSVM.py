@@ -1,8 +1,11 @@
 import numpy as np
 from sklearn.svm import OneClassSVM
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import StandardScaler
 from Analyzer import Analyzer
 from matplotlib.axes import Axes
 from typing import List
+from numpy.typing import NDArray
 
 class OneClassSVM_Analyzer(Analyzer):
     """
@@ -13,15 +16,21 @@ class OneClassSVM_Analyzer(Analyzer):
     anomalies or outliers are identified as deviations from this norm.
 
     Attributes:
-        model (OneClassSVM): The One-Class SVM model configured for anomaly detection.
+        model (Pipeline): The One-Class SVM model configured for anomaly detection, behind a feature scaler.
         data (List[List[float]]): A list to store data points for model fitting.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, nu: float = 0.01, db_threshold: float = -60) -> None:
         """
         Initializes the OneClassSVM_Analyzer with a One-Class SVM model using specified parameters.
+
+        Args:
+            nu: An upper bound on the fraction of points treated as outliers.
+            db_threshold: The dB above which an outlier counts towards a detection.
         """
-        self.model: OneClassSVM = OneClassSVM(nu=0.01, kernel='rbf', gamma='auto')
+        # Hz and dB differ by ten orders of magnitude, so both are standardised before the RBF kernel sees them
+        self.model: Pipeline = make_pipeline(StandardScaler(), OneClassSVM(nu=nu, kernel='rbf', gamma='auto'))
+        self.db_threshold = db_threshold
         self.data: List[List[float]] = []
 
     def plotData(self, X:List[List[float]], ax: Axes) -> None:
@@ -43,3 +52,20 @@ class OneClassSVM_Analyzer(Analyzer):
         colors = np.array(['blue' if p == 1 else 'red' for p in pred])
         ax.scatter(X[:, 0], X[:, 1], s=1, alpha=0.5, c=colors, label='Data Points')
         ax.legend()
+
+    def analyse(self, X: NDArray[np.float64]) -> bool:
+        """
+        Fits the One-Class SVM model to the data and checks whether any outlier is strong.
+
+        The SVM always rejects about a `nu` fraction of the bins, so the number of outliers says
+        little on its own; only outliers above `db_threshold` count, and at most once per sweep.
+
+        Args:
+            X: A NumPy array of signal data, where each row contains frequency and dB values.
+
+        Returns:
+            True if an outlier lies above `db_threshold`, otherwise False.
+        """
+        self.model.fit(X)
+        outliers = X[self.model.predict(X) == -1]
+        return bool(np.any(outliers[:, 1] > self.db_threshold))
@@ -0,0 +1,129 @@
+from typing import Optional
+from numpy.typing import NDArray
+import numpy as np
+
+class SweepAccumulator:
+    """
+    Combines consecutive hackrf_sweep results into a single spectrum to lower the noise variance.
+
+    Bins are sorted once into a stable bin index and reused for every sweep that has the same
+    layout. Duplicate frequencies within a sweep (hackrf_sweep reports overlapping segments) are
+    merged with reduceat, and the last `depth` sweeps are combined according to `mode`.
+
+    Averages ('mean', 'ema' and merged duplicates outside 'max' mode) are taken in linear power
+    and converted back to dB, like `AnalysisCache.signature`. Averaging dB values directly would
+    bias the noise floor low by a few dB compared with a single sweep.
+
+    Attributes:
+        mode (str): 'max' for max-hold, 'mean' for a moving average or 'ema' for exponential averaging.
+        depth (int): The number of sweeps kept for max-hold and moving average.
+        alpha (float): The weight of the newest sweep when `mode` is 'ema'.
+    """
+
+    MODES = ("max", "mean", "ema")
+
+    def __init__(self, mode: str = "max", depth: int = 1, alpha: float = 0.5) -> None:
+        """
+        Initializes the SweepAccumulator.
+
+        Args:
+            mode: The combining mode, one of 'max', 'mean' or 'ema'.
+            depth: The number of sweeps to combine. A depth of 1 only removes duplicate bins.
+            alpha: The smoothing factor for 'ema', between 0 (exclusive) and 1 (inclusive).
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Mode must be one of {self.MODES}, got {mode!r} instead.")
+        if not isinstance(depth, int) or depth < 1:
+            raise ValueError(f"Depth must be a positive integer, got {depth!r} instead.")
+        if not 0 < alpha <= 1:
+            raise ValueError(f"Alpha must be in (0, 1], got {alpha!r} instead.")
+        self.mode = mode
+        self.depth = depth
+        self.alpha = alpha
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Discards the bin index and every accumulated sweep, e.g. after changing channel.
+        """
+        self._raw_hz: Optional[NDArray[np.float64]] = None
+        self._order: Optional[NDArray[np.intp]] = None
+        self._starts: Optional[NDArray[np.intp]] = None
+        self._counts: Optional[NDArray[np.float64]] = None
+        self.hz: NDArray[np.float64] = np.empty(0, dtype=np.float64)
+        self._history: NDArray[np.float64] = np.empty((0, 0), dtype=np.float64)
+        self._filled = 0
+        self._head = 0
+        self._ema: Optional[NDArray[np.float64]] = None
+
+    def _index(self, hz: NDArray[np.float64]) -> None:
+        """
+        Builds the stable bin index for a sweep layout and clears the history.
+
+        Args:
+            hz: The frequencies of the sweep in the order hackrf_sweep reported them.
+        """
+        self._raw_hz = hz.copy()
+        self._order = np.argsort(hz, kind="stable")
+        sorted_hz = hz[self._order]
+        self._starts = np.flatnonzero(np.r_[True, sorted_hz[1:] != sorted_hz[:-1]])
+        self._counts = np.diff(np.r_[self._starts, hz.shape[0]]).astype(np.float64)
+        self.hz = sorted_hz[self._starts]
+        self._history = np.full((self.depth, self.hz.shape[0]), np.nan)
+        self._filled = 0
+        self._head = 0
+        self._ema = None
+
+    def merge(self, X: NDArray[np.float64]) -> NDArray[np.float64]:
+        """
+        Sorts a single sweep by frequency and merges duplicate bins without touching the history.
+
+        Duplicates are merged with the maximum in 'max' mode and with the mean power otherwise.
+
+        Args:
+            X: A NumPy array of signal data, where each row is [frequency, dB].
+
+        Returns:
+            The dB values of the sweep, one per unique frequency in `self.hz`.
+        """
+        hz = X[:, 0]
+        if self._raw_hz is None or not np.array_equal(hz, self._raw_hz):
+            self._index(hz)
+        db = X[self._order, 1]
+        if self._starts.shape[0] == db.shape[0]:
+            return db
+        if self.mode == "max":
+            return np.maximum.reduceat(db, self._starts)
+        return 10 * np.log10(np.add.reduceat(10 ** (db / 10), self._starts) / self._counts)
+
+    def update(self, X: NDArray[np.float64]) -> NDArray[np.float64]:
+        """
+        Adds a sweep to the accumulator and returns the combined spectrum.
+
+        Args:
+            X: A NumPy array of signal data, where each row is [frequency, dB].
+
+        Returns:
+            A NumPy array sorted by frequency, where each row is [frequency, combined dB].
+        """
+        if not isinstance(X, np.ndarray):
+            raise TypeError(f"Expected X to be an instance of numpy.ndarray, got {type(X)} instead.")
+        if X.shape[0] == 0:
+            return np.empty((0, 2), dtype=np.float64)
+        db = self.merge(X)
+
+        if self.mode == "ema":
+            power = 10 ** (db / 10)
+            self._ema = power if self._ema is None else self._ema + self.alpha * (power - self._ema)
+            return np.column_stack((self.hz, 10 * np.log10(self._ema)))
+
+        # 'mean' keeps linear power in the history so each sweep is converted only once
+        self._history[self._head] = db if self.mode == "max" else 10 ** (db / 10)
+        self._head = (self._head + 1) % self.depth
+        self._filled = min(self._filled + 1, self.depth)
+        window = self._history if self._filled == self.depth else self._history[:self._filled]
+        if self.mode == "max":
+            combined = window.max(axis=0)
+        else:
+            combined = 10 * np.log10(window.mean(axis=0))
+        return np.column_stack((self.hz, combined))
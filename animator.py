@@ -1,8 +1,11 @@
 import subprocess
-from typing import Tuple, List, Optional
+from typing import Optional
+from numpy.typing import NDArray
 from Analyzer import Analyzer
 from matplotlib.axes import Axes
-from utils import process_stream
+from accumulator import SweepAccumulator
+from change_cache import AnalysisCache
+from utils import parse_sweep
 import os
 import numpy as np
 import pandas as pd
@@ -18,7 +21,8 @@ class AnimationPlot:
         model (Optional[object]): An optional model instance for advanced plotting.
     """
 
-    def __init__(self, ax: Axes, model: Optional[Analyzer] = None) -> None:
+    def __init__(self, ax: Axes, model: Optional[Analyzer] = None, accumulator: Optional[SweepAccumulator] = None,
+                 cache: Optional[AnalysisCache] = None) -> None:
         """
         Initializes the AnimationPlot with the given matplotlib axes and an optional model.
 
@@ -26,7 +30,18 @@ class AnimationPlot:
             ax (Axes): The matplotlib axes object where the data is plotted.
             model (Optional[Analyzer]): An optional model instance for advanced plotting. 
                                       If provided, it should have a 'plot_data' method.
+            accumulator (Optional[SweepAccumulator]): Combines consecutive sweeps before plotting.
+                                      Defaults to a single-sweep accumulator that only removes duplicate bins.
+            cache (Optional[AnalysisCache]): If provided, frames whose sweep has not changed keep the
+                                      previous plot instead of being redrawn. It must have max_entries=0,
+                                      as only the last drawing can be kept, and cannot be combined with
+                                      a stateful model, which has to see every sweep.
         """
+        if cache is not None and cache.max_entries != 0:
+            raise ValueError(f"AnimationPlot can only keep the last drawing, so its cache needs max_entries=0, "
+                             f"got {cache.max_entries!r} instead.")
+        if cache is not None and getattr(model, "stateful", False):
+            raise ValueError(f"{type(model).__name__} is stateful and cannot be used with an AnalysisCache.")
         self.channel = 11
         self.ax = ax
         # self.CHANNELS = {
@@ -66,24 +81,20 @@ class AnimationPlot:
         self.env = os.environ.copy()
         self.env["DYLD_LIBRARY_PATH"] = self.env.get("DYLD_LIBRARY_PATH", "")
         self.model = model
+        self.accumulator = accumulator if accumulator is not None else SweepAccumulator()
+        self.cache = cache
         self.previous_f = None
         self.data_accumulator = []
 
-    def getData(self) -> Tuple[List[int], List[float]]:
+    def getData(self) -> NDArray[np.float64]:
         """
-        Retrieves data from the hackrf_sweep output and processes it into lists of frequencies and dB values.
+        Retrieves data from the hackrf_sweep output and combines it through the accumulator.
 
         Returns:
-            Tuple[List[int], List[float]]: Two lists containing the average frequencies and dB values respectively.
+            NDArray[np.float64]: An array sorted by frequency, where each row is [average frequency, dB].
         """
-        entries = {}
         output = subprocess.check_output(self.command, stderr=subprocess.DEVNULL).decode('utf-8')
-        [entries.update({record["average_hz"]: record["db"]}) for line in output.split('\n')[:-1] for record in process_stream(line)]
-
-        average_hz = [int(record) for record in entries.keys()]
-        db = [record for record in entries.values()]
-        X = np.array([[hz, db_val] for hz, db_val in zip(average_hz, db)])
-        return average_hz, db
+        return self.accumulator.update(parse_sweep(output))
 
     def animate(self, i: int) -> None:
         """
@@ -93,36 +104,50 @@ class AnimationPlot:
             i (int): The index of the current frame.
         """
         try:
-            average_hz, db = self.getData()
+            X = self.getData()
             if not self.data_accumulator:  # If the accumulator is empty, initialize it
-                for freq in average_hz:
-                    self.data_accumulator.append({'frequency': freq, 'intensities': []})
-            for i, freq in enumerate(average_hz):
-                self.data_accumulator[i]['intensities'].append(db[i])
+                for freq in X[:, 0]:
+                    self.data_accumulator.append({'frequency': int(freq), 'intensities': []})
+            for i, db_val in enumerate(X[:, 1]):
+                self.data_accumulator[i]['intensities'].append(db_val)
 
-            self.ax.clear()  
-            self.getPlotFormat()
-            low, high = self.CHANNELS[self.channel].split(":")
-            low = int(low) * 1e6
-            high = int(high) * 1e6
-            mean_db = np.mean(db)
-            X = np.array([[hz, db_val] for hz, db_val in zip(average_hz, db)])
-            X = X[X[:, 0] < high]
-            X = X[X[:, 0] > low]
-            X = X[X[:, 1] > mean_db]
-            self.ax.axhline(mean_db, color='r', linestyle='--', label=f'Mean dBm: {mean_db:.2f}')
-            if self.model and hasattr(self.model, 'plotData'):
-                # The model should have a 'plot_data' method for custom plotting.
-                self.model.plotData(X, self.ax)
+            if self.cache is not None:
+                self.cache.lookup(X, lambda: self.drawFrame(X))
             else:
-                # Default scatter plot if no model is provided.
-                self.ax.scatter(X[:, 0], X[:, 1], s=1, alpha=0.5)
-            
-            self.ax.legend()
+                self.drawFrame(X)
         except:
             # self.export_to_csv('output.csv')
             print('Close the graph')
 
+    def drawFrame(self, X: NDArray[np.float64]) -> None:
+        """
+        Clears the axes and plots one sweep, through the model if one was provided.
+
+        Args:
+            X (NDArray[np.float64]): The sweep, where each row is [frequency, dB].
+        """
+        self.ax.clear()  
+        self.getPlotFormat()
+        low, high = self.CHANNELS[self.channel].split(":")
+        low = int(low) * 1e6
+        high = int(high) * 1e6
+        mean_db = np.mean(X[:, 1])
+        in_band = (X[:, 0] < high) & (X[:, 0] > low)
+        self.ax.axhline(mean_db, color='r', linestyle='--', label=f'Mean dBm: {mean_db:.2f}')
+        if self.model and hasattr(self.model, 'plotData'):
+            # The model should have a 'plot_data' method for custom plotting.
+            # A stateful model needs the same bins every frame, so it is not limited to bins above the mean.
+            if getattr(self.model, 'stateful', False):
+                self.model.plotData(X[in_band], self.ax)
+            else:
+                self.model.plotData(X[in_band & (X[:, 1] > mean_db)], self.ax)
+        else:
+            X = X[in_band & (X[:, 1] > mean_db)]
+            # Default scatter plot if no model is provided.
+            self.ax.scatter(X[:, 0], X[:, 1], s=1, alpha=0.5)
+            
+        self.ax.legend()
+
     def export_to_csv(self, filename: str):
         """
         Transforms the accumulated data and exports it to a CSV file.
@@ -0,0 +1,163 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from numpy.typing import NDArray
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 2
+
+class Capture:
+    """
+    A recorded session of sweeps held as flat arrays.
+
+    Sweep i consists of the rows `data[offsets[i]:offsets[i + 1]]`, each row being [frequency, dB],
+    so sweeps with different bin layouts can share one array and be saved with a single `np.savez`.
+
+    Attributes:
+        timestamps (NDArray[np.float64]): The start time of each sweep. Captures without timestamps
+            (the AnimationPlot CSV export) use the sweep index instead.
+        offsets (NDArray[np.int64]): The row offsets of each sweep into `data`.
+        data (NDArray[np.float64]): The concatenated [frequency, dB] rows of every sweep.
+    """
+
+    def __init__(self, timestamps: NDArray[np.float64], offsets: NDArray[np.int64], data: NDArray[np.float64]) -> None:
+        self.timestamps = timestamps
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self) -> int:
+        return self.timestamps.shape[0]
+
+    def sweep(self, i: int) -> NDArray[np.float64]:
+        """
+        Returns the [frequency, dB] rows of sweep i.
+        """
+        return self.data[self.offsets[i]:self.offsets[i + 1]]
+
+    def slice(self, start: int, stop: int) -> "Capture":
+        """
+        Returns the sweeps in [start, stop) as a new Capture that can be sent to another process.
+        """
+        lo, hi = self.offsets[start], self.offsets[stop]
+        return Capture(self.timestamps[start:stop], self.offsets[start:stop + 1] - lo, self.data[lo:hi])
+
+    def chunks(self, seconds: float) -> List[Tuple[int, int]]:
+        """
+        Splits the capture into contiguous time ranges.
+
+        Args:
+            seconds: The length of each time range. For captures without timestamps this is a number of sweeps.
+
+        Returns:
+            A list of (start, stop) sweep index ranges covering the whole capture.
+        """
+        if len(self) == 0:
+            return []
+        bucket = np.floor((self.timestamps - self.timestamps[0]) / seconds)
+        edges = np.flatnonzero(np.diff(bucket)) + 1
+        bounds = np.r_[0, edges, len(self)]
+        return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:])]
+
+def _from_csv(path: str) -> Capture:
+    """
+    Reads the AnimationPlot.export_to_csv layout: a Frequency column followed by one column per sweep.
+    """
+    df = pd.read_csv(path)
+    hz = df.iloc[:, 0].to_numpy(dtype=np.float64)
+    db = df.iloc[:, 1:].to_numpy(dtype=np.float64).T
+    valid = ~np.isnan(db)
+    counts = valid.sum(axis=1)
+    data = np.column_stack((np.broadcast_to(hz, db.shape)[valid], db[valid]))
+    offsets = np.r_[0, np.cumsum(counts)].astype(np.int64)
+    return Capture(np.arange(db.shape[0], dtype=np.float64), offsets, data)
+
+def _from_sweep_dump(path: str) -> Capture:
+    """
+    Reads raw hackrf_sweep output. A new sweep starts when a segment begins at or below the first
+    segment of the current sweep. Within a sweep hackrf_sweep does not write segments in ascending
+    order: each tuning step covers two segments 10 MHz apart and the gap is filled by the next step.
+    Rows are kept in file order, as `parse_sweep` does for live sweeps.
+    """
+    timestamps: List[float] = []
+    offsets: List[int] = [0]
+    rows: List[NDArray[np.float64]] = []
+    total = 0
+    sweep_low: Optional[float] = None
+    with open(path) as f:
+        for line in f:
+            elements = line.rstrip("\n").split(", ")
+            if len(elements) < 7:
+                continue
+            hz_low, hz_high, width = float(elements[2]), float(elements[3]), float(elements[4])
+            if sweep_low is None or hz_low <= sweep_low:
+                if sweep_low is not None:
+                    offsets.append(total)
+                timestamps.append(datetime.strptime(f"{elements[0]} {elements[1]}", "%Y-%m-%d %H:%M:%S.%f").timestamp())
+                sweep_low = hz_low
+            n = int((hz_high - hz_low) / width)
+            db = np.array(elements[6:6 + n], dtype=np.float64)
+            hz = np.trunc(hz_low + (np.arange(db.shape[0]) + 0.5) * width)
+            rows.append(np.column_stack((hz, db)))
+            total += db.shape[0]
+    if timestamps:
+        offsets.append(total)
+    data = np.concatenate(rows) if rows else np.empty((0, 2), dtype=np.float64)
+    return Capture(np.array(timestamps, dtype=np.float64), np.array(offsets, dtype=np.int64), data)
+
+def load_capture(path: str, cache_dir: Optional[str] = ".capture_cache") -> Capture:
+    """Loads a recorded capture, reusing a parsed copy from the cache when the file is unchanged.
+
+    CSV files are read as AnimationPlot exports; anything else is read as raw hackrf_sweep output.
+
+    Args:
+        path: The path of the capture file.
+        cache_dir: The directory holding parsed captures, or None to disable caching.
+
+    Returns:
+        The parsed Capture.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        stat = os.stat(path)
+        key = f"{CACHE_VERSION}:{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+        cache_path = os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".npz")
+        if os.path.exists(cache_path):
+            with np.load(cache_path) as cached:
+                return Capture(cached["timestamps"], cached["offsets"], cached["data"])
+
+    capture = _from_csv(path) if path.lower().endswith(".csv") else _from_sweep_dump(path)
+
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path[:-4]}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, timestamps=capture.timestamps, offsets=capture.offsets, data=capture.data)
+        os.replace(tmp_path, cache_path)
+    return capture
+
+if __name__ == "__main__":
+    # Self-check: a dump in hackrf_sweep's interleaved segment order must load as whole sweeps
+    import tempfile
+
+    width = 1e6
+    order = (2400e6, 2410e6, 2405e6, 2415e6)
+    lines = []
+    for sweep in range(3):
+        stamp = f"2024-01-01, 12:00:{sweep:02d}.000000"
+        for low in order:
+            db = ", ".join(f"{-70 + sweep:.2f}" for _ in range(5))
+            lines.append(f"{stamp}, {low:.0f}, {low + 5e6:.0f}, {width:.2f}, 20, {db}\n")
+    path = os.path.join(tempfile.mkdtemp(), "interleaved.txt")
+    with open(path, "w") as f:
+        f.writelines(lines)
+    capture = load_capture(path, cache_dir=None)
+    os.remove(path)
+    sizes = np.diff(capture.offsets)
+    print(f"{len(capture)} sweeps of {sizes.tolist()} bins")
+    assert len(capture) == 3 and np.all(sizes == 20)
+    assert np.all(np.diff(capture.timestamps) == 1)
+    for i in range(3):
+        X = capture.sweep(i)
+        assert np.array_equal(np.sort(X[:, 0]), np.trunc(2400e6 + (np.arange(20) + 0.5) * width))
+        assert np.all(X[:, 1] == -70 + i)
@@ -0,0 +1,127 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+from numpy.typing import NDArray
+import time
+import numpy as np
+
+T = TypeVar("T")
+
+class AnalysisCache:
+    """
+    Skips re-analysis of sweeps that are not materially different from ones already analysed.
+
+    Each sweep is reduced to a sketch: the mean power of `segments` contiguous groups of bins, in dB.
+    A sweep whose sketch is within `tolerance` dB of the last analysed sweep in every segment bypasses
+    analysis and reuses that result. Otherwise the sketch is quantized to `tolerance` dB steps and
+    looked up in a small LRU cache of earlier results before falling back to a full analysis.
+
+    Stateful analyzers such as Burst_Analyzer need to see every sweep and should not be cached.
+
+    Attributes:
+        tolerance (float): The largest per-segment change in dB that still counts as unchanged.
+        segments (int): The number of segments in the sketch.
+        max_entries (int): The number of results kept in the LRU cache.
+        last_cached (bool): Whether the last `lookup` reused an earlier result.
+    """
+
+    def __init__(self, tolerance: float = 1.0, segments: int = 32, max_entries: int = 64) -> None:
+        """
+        Initializes the AnalysisCache.
+
+        Args:
+            tolerance: The largest per-segment change in dB that still counts as unchanged.
+            segments: The number of segments in the sketch.
+            max_entries: The number of results kept in the LRU cache. 0 disables it, leaving only the
+                bypass, which suits work whose effect cannot be replayed such as redrawing a plot.
+        """
+        if tolerance <= 0:
+            raise ValueError(f"Tolerance must be positive, got {tolerance!r} instead.")
+        self.tolerance = tolerance
+        self.segments = segments
+        self.max_entries = max_entries
+        self.last_cached = False
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._last: Optional[Tuple[Tuple[int, float, float], NDArray[np.float64]]] = None
+        self._last_result: Any = None
+        self.sweeps = 0
+        self.hits = 0
+        self.bypasses = 0
+        self.seconds_spent = 0.0
+
+    def signature(self, X: NDArray[np.float64]) -> Tuple[Tuple[int, float, float], NDArray[np.float64]]:
+        """
+        Computes the sketch of a sweep.
+
+        Args:
+            X: A NumPy array of signal data, where each row is [frequency, dB].
+
+        Returns:
+            The bin layout (count, first and last frequency) and the mean power of each segment in dB.
+        """
+        n = X.shape[0]
+        layout = (n, float(X[0, 0]), float(X[-1, 0])) if n else (0, 0.0, 0.0)
+        if n == 0:
+            return layout, np.empty(0)
+        starts = np.unique(np.linspace(0, n, min(self.segments, n), endpoint=False).astype(np.intp))
+        power = np.add.reduceat(10 ** (X[:, 1] / 10), starts) / np.diff(np.r_[starts, n])
+        return layout, 10 * np.log10(power)
+
+    def _is_near_last(self, layout: Tuple[int, float, float], sketch: NDArray[np.float64]) -> bool:
+        if self._last is None or self._last[0] != layout:
+            return False
+        return bool(np.all(np.abs(sketch - self._last[1]) <= self.tolerance))
+
+    def lookup(self, X: NDArray[np.float64], compute: Callable[[], T]) -> T:
+        """
+        Returns the result for a sweep, calling `compute` only if no earlier result can be reused.
+
+        Args:
+            X: A NumPy array of signal data, where each row is [frequency, dB].
+            compute: Runs the full analysis of X.
+
+        Returns:
+            The reused or newly computed result.
+        """
+        self.sweeps += 1
+        layout, sketch = self.signature(X)
+        if self._is_near_last(layout, sketch):
+            self.bypasses += 1
+            self.last_cached = True
+            return self._last_result
+
+        key = (layout, np.floor(sketch / self.tolerance).astype(np.int32).tobytes())
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            result = self._entries[key]
+            self.hits += 1
+            self.last_cached = True
+        else:
+            start = time.perf_counter()
+            result = compute()
+            self.seconds_spent += time.perf_counter() - start
+            self.last_cached = False
+            if self.max_entries:
+                self._entries[key] = result
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        self._last = (layout, sketch)
+        self._last_result = result
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Summarises how much work the cache has avoided.
+
+        Returns:
+            A dictionary with the number of sweeps, the hit and bypass rates, and the analysis time
+            spent and saved in seconds. Time saved is estimated from the mean time of a full analysis.
+        """
+        misses = self.sweeps - self.hits - self.bypasses
+        mean = self.seconds_spent / misses if misses else 0.0
+        return {
+            "sweeps": self.sweeps,
+            "hit_rate": self.hits / self.sweeps if self.sweeps else 0.0,
+            "bypass_rate": self.bypasses / self.sweeps if self.sweeps else 0.0,
+            "seconds_spent": self.seconds_spent,
+            "seconds_saved": mean * (self.hits + self.bypasses),
+        }
@@ -0,0 +1,261 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+from threading import Thread, Event
+import queue
+import sqlite3
+import time
+
+Timestamp = Union[float, datetime]
+
+class DetectionStore:
+    """
+    An append-optimised store for per-sweep detection events backed by SQLite in WAL mode.
+
+    Events are queued by `record` without touching the disk and written in batches by a
+    background thread, so the scan loop never waits on I/O. The table is indexed by time and
+    by channel and time, and rows older than `retention` seconds are pruned periodically.
+
+    Attributes:
+        path (str): The path of the SQLite database file.
+        batch_size (int): The maximum number of events written per transaction.
+        flush_interval (float): The longest time in seconds an event waits in the queue.
+        retention (Optional[float]): The age in seconds after which events are deleted, or None to keep them.
+        dropped (int): The number of events discarded because the queue was full or the writer had stopped.
+        failed (int): The number of events the writer could not insert, e.g. because of a NaN score.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS detections (
+            id INTEGER PRIMARY KEY,
+            timestamp REAL NOT NULL,
+            channel INTEGER NOT NULL,
+            score REAL NOT NULL,
+            count INTEGER NOT NULL,
+            detected INTEGER NOT NULL,
+            analyzer TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_detections_timestamp ON detections (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_detections_channel_timestamp ON detections (channel, timestamp);
+    """
+    COLUMNS = ("timestamp", "channel", "score", "count", "detected", "analyzer")
+
+    def __init__(self, path: str = "detections.db", batch_size: int = 256, flush_interval: float = 0.5,
+                 retention: Optional[float] = 7 * 24 * 3600, max_pending: int = 100000) -> None:
+        """
+        Initializes the DetectionStore, creating the database if needed and starting the writer thread.
+
+        Args:
+            path: The path of the SQLite database file.
+            batch_size: The maximum number of events written per transaction.
+            flush_interval: The longest time in seconds an event waits in the queue before being written.
+            retention: The age in seconds after which events are deleted, or None to keep them forever.
+            max_pending: The maximum number of queued events before new ones are dropped.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention = retention
+        self.dropped = 0
+        self.failed = 0
+        self._queue: "queue.Queue[Tuple[Any, ...]]" = queue.Queue(maxsize=max_pending)
+        self._closed = Event()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(self.SCHEMA)
+        conn.close()
+
+        self._writer = Thread(target=self._run, daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def record(self, channel: int, score: float, count: int, detected: bool,
+               analyzer: Optional[str] = None, timestamp: Optional[float] = None) -> None:
+        """
+        Queues a detection event for writing. This never blocks; if the queue is full or the writer
+        thread has stopped, the event is dropped.
+
+        Args:
+            channel: The channel the sweep was taken on.
+            score: The analyzer score for the sweep.
+            count: The running count of the scan when the sweep was analysed.
+            detected: Whether the running count had crossed the scan threshold.
+            analyzer: The name of the analyzer that produced the score.
+            timestamp: The time of the sweep as a Unix timestamp. Defaults to now.
+        """
+        if self._closed.is_set():
+            raise RuntimeError("DetectionStore is closed.")
+        event = (time.time() if timestamp is None else timestamp, channel, float(score), int(count), int(detected), analyzer)
+        if not self._writer.is_alive():
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        """
+        Writer loop: drains the queue in batches and applies the retention policy.
+
+        If the loop itself fails, the remaining events are discarded so that `flush` and `close` return.
+        """
+        try:
+            conn = self._connect()
+            last_prune = 0.0
+            while not (self._closed.is_set() and self._queue.empty()):
+                try:
+                    batch = [self._queue.get(timeout=self.flush_interval)]
+                except queue.Empty:
+                    batch = []
+                while batch and len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                try:
+                    if batch:
+                        self._insert(conn, batch)
+                except Exception:
+                    self.failed += len(batch)
+                    raise
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if self.retention is not None and time.time() - last_prune > 60:
+                    last_prune = time.time()
+                    try:
+                        with conn:
+                            conn.execute("DELETE FROM detections WHERE timestamp < ?", (last_prune - self.retention,))
+                    except sqlite3.Error as e:
+                        print(f"DetectionStore: pruning failed: {e}")
+            conn.close()
+        except Exception as e:
+            print(f"DetectionStore: writer stopped: {e}")
+        finally:
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self.dropped += 1
+                self._queue.task_done()
+
+    def _insert(self, conn: sqlite3.Connection, batch: List[Tuple[Any, ...]]) -> None:
+        """
+        Inserts a batch in one transaction. If that fails, the events are inserted one at a time
+        so that only the invalid ones are lost.
+        """
+        sql = f"INSERT INTO detections ({', '.join(self.COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)"
+        try:
+            with conn:
+                conn.executemany(sql, batch)
+            return
+        except sqlite3.Error:
+            pass
+        for event in batch:
+            try:
+                with conn:
+                    conn.execute(sql, event)
+            except sqlite3.Error as e:
+                self.failed += 1
+                print(f"DetectionStore: dropped event {event}: {e}")
+
+    def flush(self) -> None:
+        """
+        Blocks until every event queued so far has been written, or the writer thread has stopped.
+        """
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks and self._writer.is_alive():
+                self._queue.all_tasks_done.wait(self.flush_interval)
+
+    def query(self, channel: Optional[int] = None, start: Optional[Timestamp] = None, end: Optional[Timestamp] = None,
+              detected: Optional[bool] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the stored events matching all of the given filters, oldest first.
+
+        Events still waiting in the queue are not visible; call `flush` first if they are needed.
+
+        Args:
+            channel: Only return events from this channel.
+            start: Only return events at or after this time (Unix timestamp or datetime).
+            end: Only return events before this time (Unix timestamp or datetime).
+            detected: Only return events whose detected flag matches.
+            limit: The maximum number of events to return.
+
+        Returns:
+            A list of dictionaries, one per event, with a `datetime` key in place of the raw timestamp.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if channel is not None:
+            clauses.append("channel = ?")
+            params.append(channel)
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start.timestamp() if isinstance(start, datetime) else start)
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(end.timestamp() if isinstance(end, datetime) else end)
+        if detected is not None:
+            clauses.append("detected = ?")
+            params.append(int(detected))
+        sql = f"SELECT {', '.join(self.COLUMNS)} FROM detections"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        return [{
+            "datetime": datetime.fromtimestamp(ts),
+            "channel": ch,
+            "score": score,
+            "count": count,
+            "detected": bool(det),
+            "analyzer": analyzer,
+        } for ts, ch, score, count, det, analyzer in rows]
+
+    def prune(self, older_than: Optional[float] = None) -> int:
+        """
+        Deletes events older than the given age immediately.
+
+        Args:
+            older_than: The age in seconds. Defaults to the store's retention.
+
+        Returns:
+            The number of deleted events.
+        """
+        age = self.retention if older_than is None else older_than
+        if age is None:
+            return 0
+        conn = self._connect()
+        try:
+            with conn:
+                return conn.execute("DELETE FROM detections WHERE timestamp < ?", (time.time() - age,)).rowcount
+        finally:
+            conn.close()
+
+    def close(self) -> None:
+        """
+        Writes any queued events and stops the writer thread.
+        """
+        if not self._closed.is_set():
+            self._closed.set()
+            self._writer.join()
+
+    def __enter__(self) -> "DetectionStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
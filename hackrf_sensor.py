@@ -2,13 +2,52 @@ from abc import ABC, abstractmethod
 import os
 import subprocess
 import numpy as np
-from utils import process_stream
+from typing import Iterator, NamedTuple, Optional
+from utils import parse_sweep
 from Analyzer import Analyzer
+from accumulator import SweepAccumulator
+from detection_store import DetectionStore
+from change_cache import AnalysisCache
 from numpy.typing import NDArray
 import time
 import socket
 import pickle
 
+# Frequency range in MHz (low:high) swept for each Wi-Fi channel
+CHANNELS = {
+    1: '2401:2423',
+    2: '2406:2428',
+    3: '2411:2433',
+    4: '2416:2438',
+    5: '2421:2443',
+    6: '2426:2448',
+    7: '2431:2453',
+    8: '2436:2458',
+    9: '2441:2463',
+    10: '2446:2468',
+    11: '2451:2473',
+    12: '2456:2478',
+    13: '2461:2483',
+    14: '2473:2495'
+}
+
+class SweepEvent(NamedTuple):
+    """
+    The result of analysing a single sweep during a scan.
+
+    Attributes:
+        timestamp (float): The Unix time at which the sweep was captured.
+        channel (int): The channel that was swept.
+        score (float): The analyzer score of the sweep, including the mean-dB bump.
+        count (float): The running count of the scan after this sweep.
+        detected (bool): Whether the running count has exceeded the scan threshold.
+    """
+    timestamp: float
+    channel: int
+    score: float
+    count: float
+    detected: bool
+
 class SensorModule(ABC):
     @abstractmethod
     def scan(self, channel: int, time_frame: float, threshold: int) -> bool:
@@ -31,39 +70,41 @@ class HackRFModule(SensorModule):
 
     Attributes:
         model (Analyzer): An instance of Analyzer used for signal analysis.
+        accumulator (Optional[SweepAccumulator]): Combines consecutive sweeps before analysis, if set.
+        store (Optional[DetectionStore]): Receives one event per analysed sweep, if set.
+        mean_db_threshold (float): The sweep mean dB above which a sweep adds one to the count.
+        cache (Optional[AnalysisCache]): Reuses analysis results for sweeps that have not changed, if set.
     """
     
-    def __init__(self, model: Analyzer, ip: str = "", port: int = 0) -> None:
+    def __init__(self, model: Analyzer, ip: str = "", port: int = 0, accumulator: Optional[SweepAccumulator] = None,
+                 store: Optional[DetectionStore] = None, mean_db_threshold: float = -59,
+                 cache: Optional[AnalysisCache] = None) -> None:
         """
         Initializes the HackRFModule with a specific Analyzer model.
 
         Args:
             model: An instance of the Analyzer class for analyzing signals.
+            accumulator: An optional SweepAccumulator applied to every sweep before it is analysed.
+            store: An optional DetectionStore that every sweep's result is recorded to.
+            mean_db_threshold: The sweep mean dB above which a sweep adds one to the count.
+            cache: An optional AnalysisCache that skips analysing sweeps similar to recent ones.
+                Not allowed with a stateful model, which has to see every sweep.
         """
+        if cache is not None and getattr(model, "stateful", False):
+            raise ValueError(f"{type(model).__name__} is stateful and cannot be used with an AnalysisCache.")
         
         self.receiver_ip = ip
         self.receiver_port = port 
         
-        self.CHANNELS = {
-            1: '2401:2423',
-            2: '2406:2428',
-            3: '2411:2433',
-            4: '2416:2438',
-            5: '2421:2443',
-            6: '2426:2448',
-            7: '2431:2453',
-            8: '2436:2458',
-            9: '2441:2463',
-            10: '2446:2468',
-            11: '2451:2473',
-            12: '2456:2478',
-            13: '2461:2483',
-            14: '2473:2495'
-        }
+        self.CHANNELS = CHANNELS
         self.command = ["hackrf_sweep", "-f", " " , "-N", "1", "-w", "220000"]
         self.env = os.environ.copy()
         self.env["DYLD_LIBRARY_PATH"] = self.env.get("DYLD_LIBRARY_PATH", "")
         self.model = model
+        self.accumulator = accumulator
+        self.store = store
+        self.mean_db_threshold = mean_db_threshold
+        self.cache = cache
 
     def dataProcessing(self, X: NDArray[np.float64], channel: int) -> NDArray[np.float64]:
         """
@@ -90,17 +131,19 @@ class HackRFModule(SensorModule):
         # X = X[X[:, 1] > mean_db]
         return X
     
-    def scan(self, channel: int, time_frame: float, threshold: int) -> bool:
+    def scan_iter(self, channel: int, time_frame: float, threshold: int) -> Iterator[SweepEvent]:
         """
-        Scans for signals over a specified channel, time frame, and threshold using the HackRF device.
+        Scans a channel like `scan`, yielding an event as soon as each sweep has been analysed.
+
+        The caller may stop iterating at any time, e.g. once `event.detected` is True.
 
         Args:
             channel: The channel number to scan.
             time_frame: The time frame in seconds over which to perform the scan.
-            threshold: The threshold for the number of analyses to consider the scan successful.
+            threshold: The count above which a sweep's event is marked as detected.
 
         Returns:
-            True if the number of successful analyses meets or exceeds the threshold, False otherwise.
+            An iterator of SweepEvent, one per sweep.
         """
         if not isinstance(channel, int):
             raise TypeError(f"Channel must be an integer, got {type(channel)} instead.")
@@ -108,19 +151,35 @@ class HackRFModule(SensorModule):
             raise TypeError(f"Time frame must be a number, got {type(time_frame)} instead.")
         if not isinstance(threshold, int):
             raise TypeError(f"Threshold must be an integer, got {type(threshold)} instead.")
-        
+        return self._sweeps(channel, time_frame, threshold)
+
+    def _sweeps(self, channel: int, time_frame: float, threshold: int) -> Iterator[SweepEvent]:
+        """
+        Generator behind `scan_iter`, kept separate so argument errors are raised on the call itself.
+        """
+        if self.accumulator is not None and self.command[2] != self.CHANNELS[channel]:
+            self.accumulator.reset()
         self.command[2] = self.CHANNELS[channel]
-        count = 0
+        count = 0.0
         start = time.time()
         while (time.time()-start < time_frame):
             output = subprocess.check_output(self.command, stderr=subprocess.DEVNULL).decode('utf-8')
-            X = np.array([[int(record['average_hz']), record['db']] 
-                        for line in output.split('\n')[:-1] 
-                        for record in process_stream(line)])
-                        
-            count += self.model.analyse(X)
-            if np.mean(X[:, 1]) > -59:
-                count += 1
+            timestamp = time.time()
+            X = parse_sweep(output)
+            if self.accumulator is not None:
+                X = self.accumulator.update(X)
+
+            if self.cache is not None:
+                score = self.cache.lookup(X, lambda: self.model.analyse(X))
+            else:
+                score = self.model.analyse(X)
+            # Analyzers return bools, ints or NumPy scalars; events and the store always get floats
+            score = float(score)
+            if np.mean(X[:, 1]) > self.mean_db_threshold:
+                score += 1
+            count += score
+            if self.store is not None:
+                self.store.record(channel, score, count, count > threshold, type(self.model).__name__, timestamp)
             
             # Information about the receiving device
             #if self.receiver_ip:
@@ -132,6 +191,28 @@ class HackRFModule(SensorModule):
             #       sock.sendall(message)
 
             # X = self.dataProcessing(X, channel)
+            yield SweepEvent(timestamp, channel, score, count, bool(count > threshold))
+
+    def scan(self, channel: int, time_frame: float, threshold: int, stop_early: bool = False) -> bool:
+        """
+        Scans for signals over a specified channel, time frame, and threshold using the HackRF device.
+
+        Args:
+            channel: The channel number to scan.
+            time_frame: The time frame in seconds over which to perform the scan.
+            threshold: The threshold for the number of analyses to consider the scan successful.
+            stop_early: If True, return as soon as the threshold is exceeded instead of scanning
+                for the whole time frame.
+
+        Returns:
+            True if the number of successful analyses exceeds the threshold, False otherwise.
+        """
+        count = 0
+        for event in self.scan_iter(channel, time_frame, threshold):
+            count = event.count
+            if stop_early and event.detected:
+                break
+
         if self.receiver_ip:
             result = "not"
             if count > threshold:
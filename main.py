@@ -9,6 +9,7 @@ from GMM import GMM_Analyzer
 from HDBSCAN import HDBSCAN_Analyzer
 from hackrf_sensor import HackRFModule
 from utils import check_hackrf_device
+from detection_store import DetectionStore
 import socket
 import pickle
 
@@ -37,14 +38,16 @@ def main() -> None:
         analyzer = HDBSCAN_Analyzer()
         receiver_ip = "192.168.69.168"
         receiver_port = 12345
-        sensor = HackRFModule(analyzer, "192.168.69.168", 12345)
+        store = DetectionStore("detections.db")
+        sensor = HackRFModule(analyzer, "192.168.69.168", 12345, store=store)
         print("Set up")
         while True:
             try:
-            	detection  = sensor.scan(channel=8, time_frame=2, threshold=3)
+            	detection  = sensor.scan(channel=8, time_frame=2, threshold=3, stop_early=True)
             	print(f"Detection: {detection}")
             except KeyboardInterrupt:
                 print("\nShutting down")
+                store.close()
                 break
             except:
                 pass
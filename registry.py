@@ -0,0 +1,40 @@
+from typing import Any, Dict, Type
+import importlib
+from Analyzer import Analyzer
+
+# Analyzers available to offline tools, by short name. Modules are imported on first use so
+# that a missing optional dependency (e.g. hdbscan) only affects the analyzers that need it.
+ANALYZERS: Dict[str, str] = {
+    "HDBSCAN": "HDBSCAN:HDBSCAN_Analyzer",
+    "GMM": "GMM:GMM_Analyzer",
+    "IF": "IF:IsolationForest_Analyzer",
+    "OCSVM": "OCSVM:OneClassSVM_Analyzer",
+    "BURST": "Burst:Burst_Analyzer",
+    "ENSEMBLE": "Ensemble:Ensemble_Analyzer",
+}
+
+def analyzer_class(name: str) -> Type[Analyzer]:
+    """Looks up the class of a registered analyzer without instantiating it.
+
+    Args:
+        name: The short name of the analyzer, one of the keys of `ANALYZERS`.
+
+    Returns:
+        The analyzer class.
+    """
+    if name not in ANALYZERS:
+        raise KeyError(f"Unknown analyzer {name!r}, expected one of {sorted(ANALYZERS)}.")
+    module_name, class_name = ANALYZERS[name].split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+def load_analyzer(name: str, **params: Any) -> Analyzer:
+    """Instantiates a registered analyzer by name.
+
+    Args:
+        name: The short name of the analyzer, one of the keys of `ANALYZERS`.
+        **params: Keyword arguments passed to the analyzer's constructor.
+
+    Returns:
+        A new instance of the analyzer.
+    """
+    return analyzer_class(name)(**params)
@@ -0,0 +1,218 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+import numpy as np
+import pandas as pd
+from capture import Capture, load_capture
+from hackrf_sensor import CHANNELS
+from registry import ANALYZERS, load_analyzer
+
+# Constructor parameters searched for each analyzer. Each list includes the production
+# default so that it shows up in the results for comparison.
+SEARCH_SPACE: Dict[str, Dict[str, List[Any]]] = {
+    "HDBSCAN": {"min_cluster_size": [5, 8, 12, 16], "db_threshold": [-66, -63, -60, -57]},
+    "GMM": {"db_threshold": [-66, -63, -60, -57]},
+    "IF": {"contamination": [0.005, 0.01, 0.02, 0.05]},
+    "OCSVM": {"nu": [0.005, 0.01, 0.02, 0.05], "db_threshold": [-66, -63, -60, -57]},
+    "BURST": {"window": [10, 20, 40], "k": [2.0, 3.0, 4.0]},
+}
+
+# Parameters of HackRFModule.scan. They do not affect the analyzer scores, so every
+# combination is evaluated on the same cached scores without re-running the analyzer.
+SCAN_SPACE: Dict[str, List[Any]] = {
+    "mean_db_threshold": [-65, -62, -59, -56],
+    "threshold": [1, 2, 3, 4, 5, 6],
+}
+
+# Sweeps with fewer bins than this (e.g. when --channel leaves little of the capture) score 0
+# instead of being analysed, since the clustering models cannot fit so few points.
+MIN_BINS = 32
+
+_sweeps: List[List[np.ndarray]] = []
+
+def _init_worker(sweeps: List[List[np.ndarray]]) -> None:
+    """
+    Stores the pre-filtered sweeps once per worker process so trials only send their parameters.
+    """
+    global _sweeps
+    _sweeps = sweeps
+
+def _score_trial(name: str, params: Dict[str, Any]) -> Tuple[List[np.ndarray], np.ndarray]:
+    """Runs one analyzer configuration over every sweep held by the worker.
+
+    Args:
+        name: The registered name of the analyzer.
+        params: Keyword arguments for the analyzer's constructor.
+
+    Returns:
+        The per-sweep scores of each session, and the time taken by every sweep in seconds.
+    """
+    scores: List[np.ndarray] = []
+    seconds: List[float] = []
+    for session in _sweeps:
+        analyzer = load_analyzer(name, **params)
+        out = np.empty(len(session))
+        for i, X in enumerate(session):
+            if X.shape[0] < MIN_BINS:
+                out[i] = 0
+                continue
+            start = time.perf_counter()
+            out[i] = analyzer.analyse(X)
+            seconds.append(time.perf_counter() - start)
+        scores.append(out)
+    return scores, np.array(seconds)
+
+def prepare(capture: Capture, channel: Optional[int] = None) -> List[np.ndarray]:
+    """Splits a capture into sweeps, keeping only the bins inside a channel's band.
+
+    Args:
+        capture: The parsed capture.
+        channel: The channel whose band is kept, or None to keep every bin.
+
+    Returns:
+        A list of [frequency, dB] arrays, one per sweep. Sweeps that do not cover the band are empty.
+    """
+    sweeps = [capture.sweep(i) for i in range(len(capture))]
+    if channel is None:
+        return sweeps
+    low, high = (int(f) * 1e6 for f in CHANNELS[channel].split(":"))
+    return [X[(X[:, 0] > low) & (X[:, 0] < high)] for X in sweeps]
+
+def candidates(name: str, trials: Optional[int] = None, seed: int = 0) -> List[Dict[str, Any]]:
+    """Lists the analyzer configurations to try.
+
+    Args:
+        name: The registered name of the analyzer.
+        trials: The number of configurations drawn at random, or None for the full grid.
+        seed: The seed for random search.
+
+    Returns:
+        A list of constructor keyword arguments.
+    """
+    space = SEARCH_SPACE.get(name, {})
+    grid = [dict(zip(space, values)) for values in itertools.product(*space.values())]
+    if trials is None or trials >= len(grid):
+        return grid
+    return random.Random(seed).sample(grid, trials)
+
+def evaluate(scores: Sequence[np.ndarray], means: Sequence[np.ndarray], windows: Sequence[np.ndarray],
+             labels: Sequence[bool]) -> List[Dict[str, Any]]:
+    """Replays HackRFModule.scan on cached scores for every combination in `SCAN_SPACE`.
+
+    Args:
+        scores: The analyzer score of every sweep, per session.
+        means: The mean dB of every sweep, per session.
+        windows: The start index of every scan window, per session.
+        labels: Whether a phone was present, per session.
+
+    Returns:
+        A list of dictionaries with the scan parameters and the resulting detection metrics.
+    """
+    out: List[Dict[str, Any]] = []
+    for bump, threshold in itertools.product(SCAN_SPACE["mean_db_threshold"], SCAN_SPACE["threshold"]):
+        tp = fp = tn = fn = 0
+        for score, mean, starts, label in zip(scores, means, windows, labels):
+            if starts.shape[0] == 0:
+                continue
+            counts = np.add.reduceat(score + (mean > bump), starts)
+            detected = counts > threshold
+            positives = int(np.count_nonzero(detected))
+            if label:
+                tp += positives
+                fn += detected.shape[0] - positives
+            else:
+                fp += positives
+                tn += detected.shape[0] - positives
+        total = tp + fp + tn + fn
+        out.append({
+            "mean_db_threshold": bump,
+            "threshold": threshold,
+            "accuracy": (tp + tn) / total if total else np.nan,
+            "precision": tp / (tp + fp) if tp + fp else np.nan,
+            "recall": tp / (tp + fn) if tp + fn else np.nan,
+        })
+    return out
+
+def tune(manifest: str, names: Sequence[str], window: float = 2, channel: Optional[int] = None,
+         trials: Optional[int] = None, workers: int = 0, cache_dir: str = ".capture_cache",
+         seed: int = 0) -> pd.DataFrame:
+    """Searches analyzer and scan parameters over labelled recorded sessions in parallel.
+
+    The manifest is a CSV file with `capture` and `label` columns, where `label` is 1 if a phone
+    was present for the whole session and 0 otherwise. Capture paths are relative to the manifest.
+
+    Args:
+        manifest: The path of the manifest.
+        names: The registered names of the analyzers to tune.
+        window: The scan `time_frame`; a number of sweeps for captures without timestamps.
+        channel: The channel whose band is kept before analysis, or None to keep every bin. Note that
+            HackRFModule.scan does not filter by band (dataProcessing is disabled), so this tunes a
+            different pipeline from the one that runs in production.
+        trials: The number of random configurations per analyzer, or None for a grid search.
+        workers: The number of worker processes. 0 uses one per CPU core.
+        cache_dir: The directory holding parsed captures.
+        seed: The seed for random search.
+
+    Returns:
+        A DataFrame with one row per analyzer configuration and scan setting, best accuracy first.
+    """
+    sessions = pd.read_csv(manifest)
+    base = os.path.dirname(os.path.abspath(manifest))
+    captures = [load_capture(os.path.join(base, path), cache_dir) for path in sessions["capture"]]
+    labels = [bool(label) for label in sessions["label"]]
+    sweeps = [prepare(capture, channel) for capture in captures]
+    means = [np.array([np.mean(X[:, 1]) if X.shape[0] else -np.inf for X in session]) for session in sweeps]
+    windows = [np.array([start for start, _ in capture.chunks(window)], dtype=np.intp) for capture in captures]
+
+    jobs = [(name, params) for name in names for params in candidates(name, trials, seed)]
+    rows: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(sweeps,)) as pool:
+        futures = [pool.submit(_score_trial, name, params) for name, params in jobs]
+        for (name, params), future in zip(jobs, futures):
+            scores, seconds = future.result()
+            for result in evaluate(scores, means, windows, labels):
+                rows.append({
+                    "analyzer": name,
+                    "params": json.dumps(params, sort_keys=True),
+                    **result,
+                    "mean_ms": 1000 * seconds.mean() if seconds.size else np.nan,
+                    "p95_ms": 1000 * np.percentile(seconds, 95) if seconds.size else np.nan,
+                })
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+    return df.sort_values(["accuracy", "p95_ms"], ascending=[False, True], ignore_index=True)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tune analyzer and scan thresholds on labelled captures.")
+    parser.add_argument("manifest", help="CSV file with capture and label columns")
+    parser.add_argument("-a", "--analyzers", nargs="+", default=list(ANALYZERS), choices=list(ANALYZERS))
+    parser.add_argument("-w", "--window", type=float, default=2,
+                        help="scan time_frame in seconds; sweeps per scan for CSV exports")
+    parser.add_argument("--channel", type=int, choices=list(CHANNELS),
+                        help="keep only this channel's band; production scan does not filter by band, "
+                             "so results with this option do not carry over directly")
+    parser.add_argument("-n", "--trials", type=int, help="random configurations per analyzer (default: full grid)")
+    parser.add_argument("-j", "--workers", type=int, default=0, help="worker processes (default: one per core)")
+    parser.add_argument("--budget-ms", type=float, help="drop settings whose p95 per-sweep cost exceeds this")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", default=".capture_cache")
+    parser.add_argument("-o", "--output", help="write every trial to this CSV file")
+    args = parser.parse_args()
+
+    df = tune(args.manifest, args.analyzers, args.window, args.channel, args.trials, args.workers,
+              args.cache_dir, args.seed)
+    if args.output:
+        df.to_csv(args.output, index=False)
+    if args.budget_ms is not None and not df.empty:
+        df = df[df["p95_ms"] <= args.budget_ms]
+    print(df.head(20).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
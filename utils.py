@@ -1,5 +1,7 @@
 from datetime import datetime
 from typing import Dict, List, Any
+from numpy.typing import NDArray
+import numpy as np
 import pandas as pd
 import subprocess
 
@@ -44,6 +46,32 @@ def process_stream(line: str) -> List[Dict[str, Any]]:
     
     return out
 
+def parse_sweep(output: str) -> NDArray[np.float64]:
+    """Parses the raw output of a hackrf_sweep run into an array of frequency and dB values.
+
+    Unlike `process_stream`, the timestamp columns are skipped and each line's bins are
+    converted in one go, which keeps parsing cheap enough to run on every sweep.
+
+    Args:
+        output: The decoded stdout of hackrf_sweep, one comma-separated record per line.
+
+    Returns:
+        A NumPy array where each row is [frequency, dB]. Frequencies are truncated to whole Hz.
+    """
+    rows: List[NDArray[np.float64]] = []
+    for line in output.splitlines():
+        elements = line.split(", ")
+        if len(elements) < 7:
+            continue
+        hz_low, hz_high, width = float(elements[2]), float(elements[3]), float(elements[4])
+        n = int((hz_high - hz_low) / width)
+        db = np.array(elements[6:6 + n], dtype=np.float64)
+        hz = np.trunc(hz_low + (np.arange(db.shape[0]) + 0.5) * width)
+        rows.append(np.column_stack((hz, db)))
+    if not rows:
+        return np.empty((0, 2), dtype=np.float64)
+    return np.concatenate(rows)
+
 def print_as_df(entries: List[Dict[str, Any]], log_file: str) -> None:
     """Prints a list of dictionary entries as a pandas DataFrame and logs it to a CSV file.
 